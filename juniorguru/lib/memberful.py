@@ -1,17 +1,20 @@
 import csv
-import hashlib
+import io
 import json
 import os
 import re
+import threading
 import time
-from typing import Any, Callable, Generator
+from functools import lru_cache
+from typing import Any, Callable, Generator, Iterable
 from urllib.parse import urlencode
 
 import requests
+import xxhash
 from diskcache import Cache
 from gql import Client, gql
 from gql.transport.requests import RequestsHTTPTransport
-from lxml import html
+from lxml import etree, html
 
 from juniorguru.lib import loggers
 
@@ -26,12 +29,21 @@ MEMBERFUL_EMAIL = os.environ.get("MEMBERFUL_EMAIL", "kure@junior.guru")
 
 MEMBERFUL_PASSWORD = os.environ.get("MEMBERFUL_PASSWORD")
 
-DOWNLOAD_POLLING_WAIT_SEC = 5
+DOWNLOAD_POLLING_WAIT_SEC = 0.5
+
+DOWNLOAD_POLLING_MAX_WAIT_SEC = 8
 
 
 logger = loggers.from_path(__file__)
 
 
+# One client (and thus one TCP+TLS connection pool) per API key and process,
+# so that several MemberfulAPI instances don't handshake over and over
+_clients: dict[str, Client] = {}
+
+_clients_lock = threading.Lock()
+
+
 class MemberfulAPI:
     # https://memberful.com/help/integrate/advanced/memberful-api/
     # https://juniorguru.memberful.com/api/graphql/explorer?api_user_id=52463
@@ -45,39 +57,41 @@ class MemberfulAPI:
         self.cache = cache
         self.clear_cache = clear_cache
         self.api_key = api_key or MEMBERFUL_API_KEY
-        self._client = None
 
     @property
     def client(self) -> Client:
-        if not self._client:
-            logger.debug("Connecting")
-            transport = RequestsHTTPTransport(
-                url="https://juniorguru.memberful.com/api/graphql/",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "User-Agent": USER_AGENT,
-                },
-                verify=True,
-                retries=3,
-            )
-            self._client = Client(transport=transport)
-        return self._client
+        with _clients_lock:
+            try:
+                return _clients[self.api_key]
+            except KeyError:
+                logger.debug("Connecting")
+                transport = RequestsHTTPTransport(
+                    url="https://juniorguru.memberful.com/api/graphql/",
+                    headers={
+                        "Authorization": f"Bearer {self.api_key}",
+                        "User-Agent": USER_AGENT,
+                    },
+                    verify=True,
+                    retries=3,
+                )
+                client = Client(transport=transport)
+                _clients[self.api_key] = client
+                return client
 
     def mutate(self, mutation: str, variable_values: dict) -> dict[str, Any]:
         logger.debug("Sending a mutation")
-        return self.client.execute(gql(mutation), variable_values=variable_values)
+        return self.client.execute(
+            _compile_query(mutation), variable_values=variable_values
+        )
 
     def get_nodes(
         self, query: str, variable_values: dict = None
     ) -> Generator[dict, None, None]:
-        if match := COLLECTION_NAME_RE.search(query):
-            collection_name = match.group("collection_name")
-        else:
-            raise ValueError("Could not parse collection name")
+        collection_name = _parse_collection_name(query)
         declared_count = None
         nodes_count = 0
         duplicates_count = 0
-        seen_node_ids = set()
+        seen_node_keys: set[int] = set()
         for result in self._query(
             query,
             lambda result: result[collection_name]["pageInfo"],
@@ -96,12 +110,15 @@ class MemberfulAPI:
             for edge in result[collection_name]["edges"]:
                 node = edge["node"]
                 node_id = node.get("id") or hash_data(node)
-                if node_id in seen_node_ids:
+                # track just 64bit hashes of the IDs, so the set doesn't
+                # balloon in memory over large paginated collections
+                node_key = xxhash.xxh3_64_intdigest(str(node_id).encode())
+                if node_key in seen_node_keys:
                     logger.debug(f"Dropping a duplicate node: {node_id!r}")
                     duplicates_count += 1
                 else:
                     yield node
-                    seen_node_ids.add(node_id)
+                    seen_node_keys.add(node_key)
                 nodes_count += 1
         assert (
             duplicates_count == 0
@@ -134,7 +151,9 @@ class MemberfulAPI:
                 self.cache.evict(cache_tag)
                 self.clear_cache = False
 
-            cache_key = hash_data(dict(query=query, variable_values=variable_values))
+            # the query text is multi-KB and stable across pages, so hash
+            # it just once and only hash the small varying part per call
+            cache_key = f"{_query_id(query)}:{hash_data(variable_values)}"
             try:
                 result = self.cache[cache_key]
                 logger.debug(f"Loading from cache: {cache_key}")
@@ -145,7 +164,9 @@ class MemberfulAPI:
         logger.debug(
             f"Querying Memberful API, variable values: {json.dumps(variable_values)}"
         )
-        result = self.client.execute(gql(query), variable_values=variable_values)
+        result = self.client.execute(
+            _compile_query(query), variable_values=variable_values
+        )
 
         if self.cache:
             logger.debug(f"Saving to cache: {cache_key}")
@@ -154,8 +175,33 @@ class MemberfulAPI:
         return result
 
 
+# The query text is stable across pages of the same collection, so both
+# the GraphQL document and the collection name can be parsed just once
+@lru_cache(maxsize=128)
+def _compile_query(query: str):
+    return gql(query)
+
+
+@lru_cache(maxsize=128)
+def _query_id(query: str) -> str:
+    return xxhash.xxh3_64_hexdigest(query.encode())
+
+
+@lru_cache(maxsize=128)
+def _parse_collection_name(query: str) -> str:
+    if match := COLLECTION_NAME_RE.search(query):
+        return match.group("collection_name")
+    raise ValueError("Could not parse collection name")
+
+
 def hash_data(data: dict) -> str:
-    return hashlib.sha256(json.dumps(data).encode()).hexdigest()
+    # canonical serialization, so the same data always produces the same
+    # hash, regardless of dict ordering; xxHash because it's just a cache
+    # key, no need for a cryptographic function
+    data_canonical = json.dumps(
+        data, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return xxhash.xxh3_128_hexdigest(data_canonical.encode())
 
 
 class DownloadError(Exception):
@@ -202,11 +248,23 @@ class MemberfulCSV:
         form.fields["password"] = self.password
         response = session.post(form.action, data=form.form_values())
         response.raise_for_status()
-        html_tree = html.fromstring(response.content)
-        csrf_token = html_tree.cssselect('meta[name="csrf-token"]')[0].get("content")
+        csrf_token = self._scrape_csrf_token(response.content)
         logger.debug("Success!")
         return session, csrf_token
 
+    def _scrape_csrf_token(self, content: bytes) -> str:
+        # The token sits in a <meta> tag in <head>, so there's no need to
+        # build a tree of the whole page just to read it. Pull-parse the
+        # content and stop as soon as the tag is found
+        parser = etree.HTMLPullParser(events=("end",), tag="meta")
+        for i in range(0, len(content), 16384):
+            parser.feed(content[i : i + 16384])
+            for _, element in parser.read_events():
+                if element.get("name") == "csrf-token":
+                    return element.get("content")
+                element.clear()
+        raise ValueError("Could not find the CSRF token")
+
     def download_csv(self, params: dict):
         cache_tag = self.__class__.__name__.lower()
 
@@ -235,32 +293,52 @@ class MemberfulCSV:
         download_url = f"{response.headers['Location']}/download"
 
         success = False
-        for attempt_no in range(1, 10):
+        wait_sec = DOWNLOAD_POLLING_WAIT_SEC
+        for attempt_no in range(1, 12):
             logger.debug(
-                f"Attempt #{attempt_no}, waiting {DOWNLOAD_POLLING_WAIT_SEC}s for {download_url}"
+                f"Attempt #{attempt_no}, waiting {wait_sec}s for {download_url}"
             )
-            time.sleep(DOWNLOAD_POLLING_WAIT_SEC)
+            time.sleep(wait_sec)
+            wait_sec = min(wait_sec * 1.7, DOWNLOAD_POLLING_MAX_WAIT_SEC)
+            response = self.session.get(download_url, stream=True)
             try:
-                response = self.session.get(download_url)
                 response.raise_for_status()
             except requests.exceptions.HTTPError as e:
                 logger.debug(str(e))
+                response.close()
             else:
                 logger.debug("Success!")
                 success = True
                 break
         if not success:
             raise DownloadError("Failed to download the CSV export")
-        data = response.content.decode("utf-8")
 
+        # Memberful doesn't declare a charset, so be explicit instead of
+        # letting requests fall back to ISO-8859-1 (would mangle Czech names)
+        response.encoding = "utf-8"
+        # stream the body line by line, so parsing overlaps the download
+        # and the whole export never has to sit in memory twice
+        lines = response.iter_lines(decode_unicode=True)
         if self.cache:
-            logger.debug(f"Saving to cache: {cache_key}")
-            self.cache.set(cache_key, data, tag=cache_tag)
-
-        return self._parse_csv(data)
+            # the cache entry gets written only once the reader consumes
+            # all the lines, so stopping early forfeits caching (but can
+            # never cache a truncated export)
+            lines = self._cache_lines(cache_key, cache_tag, lines)
+        return csv.DictReader(lines)
+
+    def _cache_lines(
+        self, cache_key: str, cache_tag: str, lines: Iterable[str]
+    ) -> Generator[str, None, None]:
+        buffer = []
+        for line in lines:
+            buffer.append(line)
+            yield line
+        logger.debug(f"Saving to cache: {cache_key}")
+        self.cache.set(cache_key, "\n".join(buffer), tag=cache_tag)
 
     def _parse_csv(self, content: str) -> csv.DictReader:
-        return csv.DictReader(content.splitlines())
+        # StringIO doesn't copy the content, unlike content.splitlines()
+        return csv.DictReader(io.StringIO(content))
 
 
 def memberful_url(account_id: int | str) -> str:
@@ -47,7 +47,14 @@ class SqliteDatabase(BaseSqliteDatabase):
         return ConnectionContext(self)
 
 
-db = SqliteDatabase(DB_FILE, pragmas={"journal_mode": "wal"})
+db = SqliteDatabase(
+    DB_FILE,
+    pragmas={
+        "journal_mode": "wal",
+        "temp_store": "memory",
+        "mmap_size": 268435456,  # 256 MB
+    },
+)
 
 
 db.func("czech_sort")(czech_sort_key)
@@ -325,8 +325,11 @@ class ClubMessage(BaseModel):
 
     @classmethod
     def digest_listing(cls, since_dt, limit=5):
+        # selecting the author eagerly, so that accessing it later
+        # doesn't fire a separate query per message
         return (
-            cls.select()
+            cls.select(cls, ClubUser)
+            .join(ClubUser)
             .where(
                 cls.is_private == False,
                 ClubMessage.parent_channel_id.not_in(UPVOTES_EXCLUDE_CHANNELS),
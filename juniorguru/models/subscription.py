@@ -3,11 +3,12 @@ import math
 from collections import Counter
 from datetime import date, datetime, timedelta
 from enum import StrEnum, unique
-from functools import wraps
+from functools import lru_cache, wraps
 from numbers import Number
-from typing import Callable, Generator, Iterable, Self
+from typing import Any, Callable, Generator, Iterable, Self
 
 from peewee import (
+    EXCLUDED,
     BooleanField,
     Case,
     CharField,
@@ -19,12 +20,17 @@ from peewee import (
 from playhouse.shortcuts import model_to_dict
 
 from juniorguru.lib.charts import month_range
+from juniorguru.lib.chunks import chunks
 from juniorguru.models.base import BaseModel, check_enum
 from juniorguru.models.club import ClubUser
 
 
 LEGACY_PLANS_DELETED_ON = date(2023, 2, 24)
 
+MONTHS_MISSING_SUBSCRIPTIONS_DATA = {
+    (LEGACY_PLANS_DELETED_ON.year, LEGACY_PLANS_DELETED_ON.month),
+}
+
 
 @unique
 class SubscriptionActivityType(StrEnum):
@@ -101,16 +107,32 @@ def uses_data_from_subscriptions(default: Callable = None) -> Callable:
 
 
 def is_missing_subscriptions_data(month: date) -> bool:
-    if month < LEGACY_PLANS_DELETED_ON:
-        return True
-    if month_range(month) == month_range(LEGACY_PLANS_DELETED_ON):
-        return True
-    return False
+    return (
+        month < LEGACY_PLANS_DELETED_ON
+        or (month.year, month.month) in MONTHS_MISSING_SUBSCRIPTIONS_DATA
+    )
 
 
 class SubscriptionActivity(BaseModel):
     class Meta:
-        indexes = ((("type", "account_id", "happened_on"), True),)
+        indexes = (
+            (("type", "account_id", "happened_on"), True),
+            (("account_id", "type", "happened_on"), False),
+            # covering index for the latest-activity-per-account scans
+            # in listing() and active_summary()
+            (
+                (
+                    "account_id",
+                    "happened_on",
+                    "happened_at",
+                    "type",
+                    "subscription_type",
+                    "subscription_interval",
+                    "account_has_feminine_name",
+                ),
+                False,
+            ),
+        )
 
     type = CharField(constraints=[check_enum("type", SubscriptionActivityType)])
     account_id = IntegerField(index=True)
@@ -171,6 +193,29 @@ class SubscriptionActivity(BaseModel):
         )
         insert.execute()
 
+    @classmethod
+    def add_many(cls, rows: Iterable[dict], batch_size: int = 500) -> None:
+        unique_key_fields = cls._meta.indexes[0][0]
+        conflict_target = [getattr(cls, field) for field in unique_key_fields]
+        field_names = [field for field in cls._meta.fields if field != "id"]
+
+        update = {
+            field: fn.coalesce(getattr(EXCLUDED, field), getattr(cls, field))
+            for field in field_names
+            if field not in unique_key_fields and field != "happened_at"
+        }
+        update[cls.happened_at] = Case(
+            None,
+            [(cls.happened_at < EXCLUDED.happened_at, EXCLUDED.happened_at)],
+            cls.happened_at,
+        )
+
+        for batch in chunks(rows, size=batch_size):
+            batch = [{field: row.get(field) for field in field_names} for row in batch]
+            cls.insert_many(batch).on_conflict(
+                action="update", update=update, conflict_target=conflict_target
+            ).execute()
+
     @classmethod
     def history_end_on(cls, buffer_days=30) -> date:
         # The 'trial_end' activities are sometimes in the future,
@@ -206,43 +251,68 @@ class SubscriptionActivity(BaseModel):
         #
         # If there's no such order, we can also assume the trial was a true trial,
         # albeit not finished yet, or not followed by an order (deactivated).
-        trial_ends = cls.select().where(
-            cls.type == SubscriptionActivityType.TRIAL_END,
-            cls.subscription_type == SubscriptionType.INDIVIDUAL,
-            cls.happened_on > LEGACY_PLANS_DELETED_ON,
+        te_cls = cls.alias("trial_ends")
+        o_cls = cls.alias("orders")
+        ts_cls = cls.alias("trial_starts")
+
+        # Subquery to select subscription type of an order happening on the same
+        # day as the trial end, but only if it's not an individual subscription
+        new_order_type = (
+            o_cls.select(o_cls.subscription_type)
+            .where(
+                o_cls.type == SubscriptionActivityType.ORDER,
+                o_cls.account_id == te_cls.account_id,
+                o_cls.happened_on == te_cls.happened_on,
+                o_cls.subscription_type != SubscriptionType.INDIVIDUAL,
+            )
+            .limit(1)
         )
-        for trial_end in trial_ends:
-            account_activities = cls.select().where(
-                cls.account_id == trial_end.account_id
+        trial_ends = (
+            te_cls.select(
+                te_cls.account_id,
+                te_cls.happened_on,
+                fn.coalesce(new_order_type, SubscriptionType.TRIAL).alias(
+                    "subscription_type"
+                ),
             )
+            .where(
+                te_cls.type == SubscriptionActivityType.TRIAL_END,
+                te_cls.subscription_type == SubscriptionType.INDIVIDUAL,
+                te_cls.happened_on > LEGACY_PLANS_DELETED_ON,
+            )
+            .alias("trial_ends")
+        )
+
+        # Subquery to tell whether an order marks the start of a trial,
+        # i.e. whether it happens on the same day as a 'trial_start' activity
+        starts_trial = ts_cls.select(ts_cls.id).where(
+            ts_cls.type == SubscriptionActivityType.TRIAL_START,
+            ts_cls.account_id == cls.account_id,
+            ts_cls.happened_on == cls.happened_on,
+        )
 
-            new_order = account_activities.where(
-                cls.type == SubscriptionActivityType.ORDER,
-                cls.happened_on == trial_end.happened_on,
-            ).first()
-
-            if (
-                not new_order
-                or new_order.subscription_type == SubscriptionType.INDIVIDUAL
-            ):
-                subscription_type = SubscriptionType.TRIAL
-            else:
-                subscription_type = new_order.subscription_type
-
-            trial_end.subscription_type = subscription_type
-            trial_end.save()
-            trial_start = account_activities.where(
-                cls.type == SubscriptionActivityType.TRIAL_START,
-                cls.happened_on < trial_end.happened_on,
-            ).get()
-            trial_start.subscription_type = subscription_type
-            trial_start.save()
-            trial_order = account_activities.where(
-                cls.type == SubscriptionActivityType.ORDER,
-                cls.happened_on == trial_start.happened_on,
-            ).first()
-            trial_order.subscription_type = subscription_type
-            trial_order.save()
+        # Single set-based update instead of three saves per trial end
+        (
+            cls.update(subscription_type=trial_ends.c.subscription_type)
+            .from_(trial_ends)
+            .where(
+                cls.account_id == trial_ends.c.account_id,
+                (
+                    (cls.type == SubscriptionActivityType.TRIAL_END)
+                    & (cls.happened_on == trial_ends.c.happened_on)
+                )
+                | (
+                    (cls.type == SubscriptionActivityType.TRIAL_START)
+                    & (cls.happened_on < trial_ends.c.happened_on)
+                )
+                | (
+                    (cls.type == SubscriptionActivityType.ORDER)
+                    & (cls.happened_on < trial_ends.c.happened_on)
+                    & fn.EXISTS(starts_trial)
+                ),
+            )
+            .execute()
+        )
 
         # By default 'deactivation' activities are without details, so let's
         # give it the details of the latest activity before it.
@@ -291,9 +361,81 @@ class SubscriptionActivity(BaseModel):
             cls.type != SubscriptionActivityType.DEACTIVATION
         )
 
+    @classmethod
+    def active_listing_dicts(cls, date: date, *fields) -> Iterable[dict]:
+        # read-only aggregates don't need full model instances, plain
+        # dicts of the few fields they look at are much cheaper
+        return cls.active_listing(date).columns(*fields).dicts()
+
+    @classmethod
+    def active_summary(cls, date: date) -> dict[str, Any]:
+        return _active_summary(date.isoformat())
+
+    @classmethod
+    def _query_active_summary(cls, date: date) -> dict[str, Any]:
+        # All the active_*_count() aggregates ask the same question about
+        # the same latest-activity-per-account scan, so let's compute them
+        # in a single query with FILTER clauses instead of one query each
+        latest_at = fn.max(cls.happened_at).alias("latest_at")
+        latest = (
+            cls.select(cls.account_id, latest_at)
+            .where(cls.happened_on <= date)
+            .group_by(cls.account_id)
+        )
+        individual = cls.subscription_type == SubscriptionType.INDIVIDUAL
+        row = (
+            cls.select(
+                fn.count(cls.id).alias("count"),
+                fn.count(cls.id)
+                .filter(cls.account_has_feminine_name == True)
+                .alias("women_count"),
+                fn.count(cls.id).filter(individual).alias("individuals_count"),
+                fn.count(cls.id)
+                .filter(
+                    individual
+                    & (cls.subscription_interval == SubscriptionInterval.YEAR)
+                )
+                .alias("individuals_yearly_count"),
+                fn.count(cls.id)
+                .filter(cls.subscription_type.is_null())
+                .alias("no_subscription_type_count"),
+                *(
+                    fn.count(cls.id)
+                    .filter(cls.subscription_type == subscription_type)
+                    .alias(f"subscription_type_{subscription_type}")
+                    for subscription_type in SubscriptionType
+                ),
+            )
+            .join(
+                latest,
+                on=(
+                    (cls.account_id == latest.c.account_id)
+                    & (cls.happened_at == latest.c.latest_at)
+                ),
+            )
+            .where(cls.type != SubscriptionActivityType.DEACTIVATION)
+            .dicts()
+            .get()
+        )
+        summary = {
+            field: row[field]
+            for field in [
+                "count",
+                "women_count",
+                "individuals_count",
+                "individuals_yearly_count",
+                "no_subscription_type_count",
+            ]
+        }
+        summary["subscription_types"] = {
+            subscription_type.value: row[f"subscription_type_{subscription_type}"]
+            for subscription_type in SubscriptionType
+        }
+        return summary
+
     @classmethod
     def active_count(cls, date: date) -> int:
-        return cls.active_listing(date).count()
+        return cls.active_summary(date)["count"]
 
     @classmethod
     def active_individuals_listing(cls, date: date) -> Iterable[Self]:
@@ -304,27 +446,18 @@ class SubscriptionActivity(BaseModel):
     @classmethod
     @uses_data_from_subscriptions()
     def active_individuals_count(cls, date: date) -> int | None:
-        return cls.active_individuals_listing(date).count()
+        return cls.active_summary(date)["individuals_count"]
 
     @classmethod
     @uses_data_from_subscriptions()
     def active_individuals_yearly_count(cls, date: date) -> int | None:
-        return (
-            cls.active_listing(date)
-            .where(
-                cls.subscription_type == SubscriptionType.INDIVIDUAL,
-                cls.subscription_interval == SubscriptionInterval.YEAR,
-            )
-            .count()
-        )
+        return cls.active_summary(date)["individuals_yearly_count"]
 
     @classmethod
     @uses_data_from_subscriptions(default=dict)
     def active_subscription_type_breakdown(cls, date: date) -> dict[str, int]:
-        counter = Counter(
-            [activity.subscription_type for activity in cls.active_listing(date)]
-        )
-        if None in counter:
+        summary = cls.active_summary(date)
+        if summary["no_subscription_type_count"]:
             raise ValueError(
                 "There are members whose latest activity is without subscription type, "
                 f"which can happen only if they're from before {LEGACY_PLANS_DELETED_ON}. "
@@ -332,10 +465,7 @@ class SubscriptionActivity(BaseModel):
                 "It's very likely these members are deactivated, but it's not reflected in the data. "
                 "See if we shouldn't observe more activities in the ACTIVITY_TYPES_MAPPING."
             )
-        return {
-            subscription_type.value: counter[subscription_type]
-            for subscription_type in SubscriptionType
-        }
+        return summary["subscription_types"]
 
     @classmethod
     @uses_data_from_subscriptions(default=dict)
@@ -367,16 +497,13 @@ class SubscriptionActivity(BaseModel):
 
     @classmethod
     def active_women_count(cls, date: date) -> int:
-        return (
-            cls.active_listing(date)
-            .where(cls.account_has_feminine_name == True)
-            .count()
-        )
+        return cls.active_summary(date)["women_count"]
 
     @classmethod
     def active_women_ptc(cls, date: date) -> int:
-        if count := cls.active_count(date):
-            return math.ceil((cls.active_women_count(date) / count) * 100)
+        summary = cls.active_summary(date)
+        if count := summary["count"]:
+            return math.ceil((summary["women_count"] / count) * 100)
         return 0
 
     @classmethod
@@ -487,7 +614,9 @@ class SubscriptionActivity(BaseModel):
 
     @classmethod
     def active_duration_avg(cls, date: date) -> int:
-        account_ids = [activity.account_id for activity in cls.active_listing(date)]
+        account_ids = [
+            row["account_id"] for row in cls.active_listing_dicts(date, cls.account_id)
+        ]
         if durations := list(cls._calc_durations(account_ids, date)):
             return sum(durations) / len(durations)
         return 0
@@ -496,7 +625,10 @@ class SubscriptionActivity(BaseModel):
     @uses_data_from_subscriptions()
     def active_individuals_duration_avg(cls, date: date) -> int:
         account_ids = [
-            activity.account_id for activity in cls.active_individuals_listing(date)
+            row["account_id"]
+            for row in cls.active_individuals_listing(date)
+            .columns(cls.account_id)
+            .dicts()
         ]
         if durations := list(cls._calc_durations(account_ids, date)):
             return sum(durations) / len(durations)
@@ -549,6 +681,14 @@ class SubscriptionActivity(BaseModel):
         return days
 
 
+# Activities are append-only during a single CLI invocation, so it's safe
+# to memoize the summaries for its duration. Keyed by ISO string to keep
+# the cache key hashable. Tests reset with _active_summary.cache_clear()
+@lru_cache(maxsize=None)
+def _active_summary(date_iso: str) -> dict[str, Any]:
+    return SubscriptionActivity._query_active_summary(date.fromisoformat(date_iso))
+
+
 class SubscriptionCancellation(BaseModel):
     account_id = IntegerField(unique=True)
     account_name = CharField()
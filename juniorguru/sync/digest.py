@@ -1,3 +1,4 @@
+import asyncio
 import textwrap
 from datetime import date, timedelta
 
@@ -52,8 +53,23 @@ async def discord_task(client: ClubClient, force_since: date):
 
     content = f"{DIGEST_EMOJI} Co se tu dělo za poslední týden? (od {since:%-d.%-m.})"
 
-    logger.info(f"Listing {TOP_MESSAGES_LIMIT} top messages")
-    messages = ClubMessage.digest_listing(since, limit=TOP_MESSAGES_LIMIT)
+    # start fetching the channel right away, so the Discord API roundtrip
+    # overlaps with querying the database
+    channel_task = asyncio.create_task(
+        client.fetch_channel(ClubChannelID.ANNOUNCEMENTS)
+    )
+
+    logger.info(
+        f"Listing {TOP_MESSAGES_LIMIT} top messages and {TOP_CHANNELS_LIMIT} top channels"
+    )
+    messages, channels_digest = await asyncio.gather(
+        asyncio.to_thread(
+            lambda: list(ClubMessage.digest_listing(since, limit=TOP_MESSAGES_LIMIT))
+        ),
+        asyncio.to_thread(
+            lambda: list(ClubMessage.digest_channels(since, limit=TOP_CHANNELS_LIMIT))
+        ),
+    )
     for n, message in enumerate(messages, start=1):
         logger.info(
             f"Message #{n}: {message.upvotes_count} votes for {message.author.display_name} in #{message.channel_name}, {message.url}"
@@ -69,8 +85,6 @@ async def discord_task(client: ClubClient, force_since: date):
         description=messages_desc,
     )
 
-    logger.info(f"Listing {TOP_CHANNELS_LIMIT} top channels")
-    channels_digest = ClubMessage.digest_channels(since, limit=TOP_CHANNELS_LIMIT)
     for n, channel_digest in enumerate(channels_digest, start=1):
         logger.info(
             f"Channel #{n}: {channel_digest['size']} characters in {channel_digest['channel_name']!r}, parent channel #{channel_digest['parent_channel_name']}"
@@ -84,7 +98,7 @@ async def discord_task(client: ClubClient, force_since: date):
         description=channels_desc,
     )
 
-    channel = await client.fetch_channel(ClubChannelID.ANNOUNCEMENTS)
+    channel = await channel_task
     with mutating_discord(channel) as proxy:
         await proxy.send(content, embeds=[messages_embed, channels_embed])
 
@@ -98,16 +112,17 @@ def format_message(message: ClubMessage) -> str:
 
 
 def format_channel_digest(channel_digest: dict) -> str:
-    text = ""
-    if channel_digest["channel_id"] == channel_digest["parent_channel_id"]:
-        text += f'**#{channel_digest["channel_name"]}**'
+    channel_id = channel_digest["channel_id"]
+    channel_name = channel_digest["channel_name"]
+    if channel_id == channel_digest["parent_channel_id"]:
+        text = f"**#{channel_name}**"
     else:
-        text += f'**{channel_digest["channel_name"]}** v #{channel_digest["parent_channel_name"]}'
+        text = f'**{channel_name}** v #{channel_digest["parent_channel_name"]}'
     text += (
         "\n"
         f'{reading_time(channel_digest["size"])} min čtení'
         " – "
-        f'[Číst diskuzi](https://discord.com/channels/{CLUB_GUILD}/{channel_digest["channel_id"]}/)'
+        f"[Číst diskuzi](https://discord.com/channels/{CLUB_GUILD}/{channel_id}/)"
     )
     return text
 
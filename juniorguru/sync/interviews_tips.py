@@ -1,3 +1,4 @@
+import asyncio
 from datetime import timedelta
 
 from discord import Color, Embed
@@ -33,11 +34,16 @@ async def discord_task(client: ClubClient):
     )
     if is_message_over_period_ago(last_message, timedelta(days=30)):
         logger.info("Last reminder is more than one month old!")
-        channel = await client.fetch_channel(ClubChannelID.INTERVIEWS)
+        # fetch the channel while the mentors query runs in a thread,
+        # so the Discord API roundtrip overlaps with the database work
+        channel, mentors = await asyncio.gather(
+            client.fetch_channel(ClubChannelID.INTERVIEWS),
+            asyncio.to_thread(lambda: list(Mentor.interviews_listing())),
+        )
         embed_mentors_description = "\n".join(
             [
                 f"[{mentor.user.display_name}]({mentor.message_url}) – {mentor.topics}"
-                for mentor in Mentor.interviews_listing()
+                for mentor in mentors
             ]
         )
         embed_mentors = Embed(
@@ -51,6 +57,12 @@ async def discord_task(client: ClubClient):
             )
         )
 
+        message_task = (
+            asyncio.create_task(channel.fetch_message(last_message.id))
+            if last_message
+            else None
+        )
+
         logger.info("Sending new reminder")
         with mutating_discord(channel) as proxy:
             await proxy.send(
@@ -62,8 +74,8 @@ async def discord_task(client: ClubClient):
                 embeds=[embed_mentors, embed_handbook],
             )
 
-        if last_message:
+        if message_task:
             logger.info("Deleting previous reminder")
-            message = await channel.fetch_message(last_message.id)
+            message = await message_task
             with mutating_discord(message) as proxy:
                 await proxy.delete()
@@ -106,22 +106,26 @@ def main(cache, from_date, clear_cache, history_path, clear_history):
         )
         for type in ACTIVITY_TYPES_MAPPING
     )
-    for activity in logger.progress(itertools.chain.from_iterable(queries)):
-        try:
-            account_id = int(activity["member"]["id"])
-        except (KeyError, TypeError):
-            logger.debug("Activity with no account ID, skipping")
-        else:
-            happened_at = datetime.utcfromtimestamp(activity["createdAt"])
-            SubscriptionActivity.add(
-                account_id=account_id,
-                account_has_feminine_name=has_feminine_name(
-                    activity["member"]["fullName"]
-                ),
-                happened_on=happened_at.date(),
-                happened_at=happened_at,
-                type=ACTIVITY_TYPES_MAPPING[activity["type"]],
-            )
+
+    def generate_activities() -> Generator[dict, None, None]:
+        for activity in logger.progress(itertools.chain.from_iterable(queries)):
+            try:
+                account_id = int(activity["member"]["id"])
+            except (KeyError, TypeError):
+                logger.debug("Activity with no account ID, skipping")
+            else:
+                happened_at = datetime.utcfromtimestamp(activity["createdAt"])
+                yield dict(
+                    account_id=account_id,
+                    account_has_feminine_name=has_feminine_name(
+                        activity["member"]["fullName"]
+                    ),
+                    happened_on=happened_at.date(),
+                    happened_at=happened_at,
+                    type=ACTIVITY_TYPES_MAPPING[activity["type"]],
+                )
+
+    SubscriptionActivity.add_many(generate_activities())
     logger.info(f"Finished with {SubscriptionActivity.total_count()} activities")
 
     logger.info("Fetching subscriptions from Memberful API")
@@ -130,12 +134,16 @@ def main(cache, from_date, clear_cache, history_path, clear_history):
     # we do it is to have a backup (and a git commits to inspect) in case there is something
     # messing with the data again.
     subscriptions = memberful.get_nodes(SUBSCRIPTIONS_GQL_PATH.read_text())
-    for subscription in logger.progress(subscriptions):
-        for activity in activities_from_subscription(subscription):
-            activity["account_has_feminine_name"] = has_feminine_name(
+    SubscriptionActivity.add_many(
+        dict(
+            activity,
+            account_has_feminine_name=has_feminine_name(
                 subscription["member"]["fullName"]
-            )
-            SubscriptionActivity.add(**activity)
+            ),
+        )
+        for subscription in logger.progress(subscriptions)
+        for activity in activities_from_subscription(subscription)
+    )
     logger.info(f"Finished with {SubscriptionActivity.total_count()} activities")
 
     logger.info("Saving history to a file")
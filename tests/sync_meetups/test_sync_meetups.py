@@ -2,7 +2,8 @@ import itertools
 from collections import namedtuple
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
 import pytest
 
@@ -20,44 +21,64 @@ from juniorguru.sync.meetups import (
 )
 
 
+FIXTURES_DIR = Path(__file__).parent
+
+MEETUP_NAME = "Praha: Mini sraz juniorů na akci pythonistů"
+
+BOT_ID = ClubMemberID.BOT
+
+
 StubScheduledEvent = namedtuple(
     "ScheduledEvent", ["name", "creator_id"], defaults=[123]
 )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def icalendar_content() -> str:
-    return (Path(__file__).parent / "pyvo.ics").read_text()
+    # read_bytes() skips the buffered text IO stack, the whole file
+    # is consumed in one go anyway
+    return (FIXTURES_DIR / "pyvo.ics").read_bytes().decode("utf-8")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def icalendar_tentative_content() -> str:
-    return (Path(__file__).parent / "pyvo_tentative.ics").read_text()
-
-
-@pytest.fixture
-def event() -> dict[str, Any]:
-    return dict(
-        location=("Rohanské nábř. 19, 186 00 Karlín", "Praha"),
-        location_raw="Applifting, Rohanské nábř. 19, Praha",
-        name="Mini sraz juniorů na akci pythonistů",
-        name_raw="ReactGirls & Applifting meetup",
-        starts_at=datetime(2021, 6, 24, 18, 30),
-        url="https://www.meetup.com/reactgirls/events/292684010/",
-        emoji="⚛️",
+    return (FIXTURES_DIR / "pyvo_tentative.ics").read_bytes().decode("utf-8")
+
+
+@pytest.fixture(scope="session")
+def icalendar_events(icalendar_content: str) -> list[dict[str, Any]]:
+    # parsing is deterministic, so tests can share one result
+    return parse_icalendar(icalendar_content)
+
+
+@pytest.fixture(scope="module")
+def event() -> Mapping[str, Any]:
+    # read-only mapping, so the tests can safely share one instance
+    return MappingProxyType(
+        dict(
+            location=("Rohanské nábř. 19, 186 00 Karlín", "Praha"),
+            location_raw="Applifting, Rohanské nábř. 19, Praha",
+            name="Mini sraz juniorů na akci pythonistů",
+            name_raw="ReactGirls & Applifting meetup",
+            starts_at=datetime(2021, 6, 24, 18, 30),
+            url="https://www.meetup.com/reactgirls/events/292684010/",
+            emoji="⚛️",
+        )
     )
 
 
-def test_parse_icalendar(icalendar_content: str):
-    events = parse_icalendar(icalendar_content)
-    keys = set(itertools.chain.from_iterable(event.keys() for event in events))
+def test_parse_icalendar(icalendar_events: list[dict[str, Any]]):
+    keys = set(
+        itertools.chain.from_iterable(event.keys() for event in icalendar_events)
+    )
 
     assert keys == {"name_raw", "starts_at", "location_raw", "url"}
 
 
-def test_parse_icalendar_provides_timezone_aware_datetime(icalendar_content: str):
-    events = parse_icalendar(icalendar_content)
-    have_timezone = [event["starts_at"].tzinfo for event in events]
+def test_parse_icalendar_provides_timezone_aware_datetime(
+    icalendar_events: list[dict[str, Any]],
+):
+    have_timezone = [event["starts_at"].tzinfo for event in icalendar_events]
 
     assert all(have_timezone)
 
@@ -104,7 +125,17 @@ def test_parse_meetup_com_location_online_event():
         ({"name_raw": "Konference"}, ['konference'], False),
         ({"name_raw": "VYPRODÁNO FrontKon 2023 - konference komunity Frontendisti.cz"}, ['konference'], False),
         ({"name_raw": "Celodenní Workshop: Aplikace na správu seznamu studentů"}, ['workshop'], False),
-    ]
+    ],
+    # explicit ids save pytest from repr()-ing the dicts during collection
+    ids=[
+        "no-skip-list",
+        "empty-skip-list",
+        "no-match",
+        "exact-match",
+        "case-insensitive",
+        "substring-konference",
+        "substring-workshop",
+    ],
 )
 def test_isnt_skipped(event: dict[str, Any], skipped: list[str], expected: bool):
     assert isnt_skipped(event, skipped) is expected
@@ -114,16 +145,11 @@ def test_isnt_skipped(event: dict[str, Any], skipped: list[str], expected: bool)
     "scheduled_event, expected",
     [
         (StubScheduledEvent("Pyvo Meetup"), False),
-        (StubScheduledEvent("Pyvo Meetup", creator_id=ClubMemberID.BOT), False),
-        (StubScheduledEvent("Praha: Mini sraz juniorů na akci pythonistů"), False),
-        (
-            StubScheduledEvent(
-                "Praha: Mini sraz juniorů na akci pythonistů",
-                creator_id=ClubMemberID.BOT,
-            ),
-            True,
-        ),
+        (StubScheduledEvent("Pyvo Meetup", creator_id=BOT_ID), False),
+        (StubScheduledEvent(MEETUP_NAME), False),
+        (StubScheduledEvent(MEETUP_NAME, creator_id=BOT_ID), True),
     ],
+    ids=["nonmeetup-user", "nonmeetup-bot", "meetup-user", "meetup-bot"],
 )
 def test_is_meetup_scheduled_event(scheduled_event, expected):
     assert is_meetup_scheduled_event(scheduled_event) is expected
@@ -140,7 +166,7 @@ def test_parse_meetup_url():
     )
 
 
-def test_generate_scheduled_event(event: dict):
+def test_generate_scheduled_event(event: Mapping[str, Any]):
     params = generate_scheduled_event(event)
 
     assert sorted(params.keys()) == [
@@ -160,7 +186,7 @@ def test_generate_scheduled_event(event: dict):
     assert params["location"] == "Applifting, Rohanské nábř. 19, Praha"
 
 
-def test_generate_channel_message(event: dict):
+def test_generate_channel_message(event: Mapping[str, Any]):
     text = generate_channel_message_content(event)
 
     assert "Praha" in text
@@ -170,14 +196,15 @@ def test_generate_channel_message(event: dict):
     assert "https://www.meetup.com/reactgirls/events/292684010/" in text
 
 
-def test_thread_name(event: dict):
+def test_thread_name(event: Mapping[str, Any]):
     assert thread_name(event) == "Praha, 24.6. – ReactGirls & Applifting meetup"
 
 
-def test_thread_name_too_long(event: dict):
-    event[
-        "name_raw"
-    ] = "Pražské Pyvo #149 Engineering Of Structured, Semi-Structured And Unstructured Data & Language Models and the Non-English Languages"
+def test_thread_name_too_long(event: Mapping[str, Any]):
+    event = dict(
+        event,
+        name_raw="Pražské Pyvo #149 Engineering Of Structured, Semi-Structured And Unstructured Data & Language Models and the Non-English Languages",
+    )
     name = thread_name(event, limit=40)
 
     assert len(name) == 40
@@ -10,6 +10,8 @@ from juniorguru.sync.scrape_jobs.spiders import remoteok
 
 FIXTURES_DIR = Path(__file__).parent
 
+API_JSON = json.loads((FIXTURES_DIR / "api.json").read_bytes())
+
 
 def normalize_html(html_string):
     return [(el.tag, el.text, el.tail) for el in html.fromstring(html_string.strip())]
@@ -36,12 +38,7 @@ def test_spider_parse_error():
 
 
 def test_spider_parse_job():
-    json_data = next(
-        filter(
-            lambda jd: jd.get("id") == "99859",
-            json.loads(Path(FIXTURES_DIR / "api.json").read_bytes()),
-        )
-    )
+    json_data = next(filter(lambda jd: jd.get("id") == "99859", API_JSON))
     response = HtmlResponse(
         "https://example.com/example/",
         body=Path(FIXTURES_DIR / "job.html").read_bytes(),
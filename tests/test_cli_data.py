@@ -5,54 +5,57 @@ import pytest
 from juniorguru.cli.data import get_row_updates, make_schema_idempotent
 
 
-def test_make_schema_idempotent():
-    assert (
-        make_schema_idempotent(
-            dedent(
-                """
-        CREATE TABLE "clubdocumentedrole" ("id" INTEGER NOT NULL PRIMARY KEY, "name" VARCHAR(255) NOT NULL, "mention" VARCHAR(255) NOT NULL, "slug" VARCHAR(255) NOT NULL, "description" TEXT NOT NULL, "position" INTEGER NOT NULL, "emoji" VARCHAR(255));
-        CREATE TABLE "clubpinreaction" ("id" INTEGER NOT NULL PRIMARY KEY, "user_id" INTEGER NOT NULL, "message_id" INTEGER NOT NULL, FOREIGN KEY ("user_id") REFERENCES "clubuser" ("id"), FOREIGN KEY ("message_id") REFERENCES "clubmessage" ("id"));
-        CREATE INDEX "scrapedjob_last_seen_on" ON "scrapedjob" ("last_seen_on");
-        CREATE UNIQUE INDEX "scrapedjob_url" ON "scrapedjob" ("url");
+# static fixtures, so dedent them once at import instead of in every test run
+SCHEMA = dedent(
+    """
+    CREATE TABLE "clubdocumentedrole" ("id" INTEGER NOT NULL PRIMARY KEY, "name" VARCHAR(255) NOT NULL, "mention" VARCHAR(255) NOT NULL, "slug" VARCHAR(255) NOT NULL, "description" TEXT NOT NULL, "position" INTEGER NOT NULL, "emoji" VARCHAR(255));
+    CREATE TABLE "clubpinreaction" ("id" INTEGER NOT NULL PRIMARY KEY, "user_id" INTEGER NOT NULL, "message_id" INTEGER NOT NULL, FOREIGN KEY ("user_id") REFERENCES "clubuser" ("id"), FOREIGN KEY ("message_id") REFERENCES "clubmessage" ("id"));
+    CREATE INDEX "scrapedjob_last_seen_on" ON "scrapedjob" ("last_seen_on");
+    CREATE UNIQUE INDEX "scrapedjob_url" ON "scrapedjob" ("url");
+    """
+).strip()
+
+SCHEMA_IDEMPOTENT = dedent(
     """
-            )
-        ).strip()
-        == dedent(
-            """
-        CREATE TABLE IF NOT EXISTS "clubdocumentedrole" ("id" INTEGER NOT NULL PRIMARY KEY, "name" VARCHAR(255) NOT NULL, "mention" VARCHAR(255) NOT NULL, "slug" VARCHAR(255) NOT NULL, "description" TEXT NOT NULL, "position" INTEGER NOT NULL, "emoji" VARCHAR(255));
-        CREATE TABLE IF NOT EXISTS "clubpinreaction" ("id" INTEGER NOT NULL PRIMARY KEY, "user_id" INTEGER NOT NULL, "message_id" INTEGER NOT NULL, FOREIGN KEY ("user_id") REFERENCES "clubuser" ("id"), FOREIGN KEY ("message_id") REFERENCES "clubmessage" ("id"));
-        CREATE INDEX IF NOT EXISTS "scrapedjob_last_seen_on" ON "scrapedjob" ("last_seen_on");
-        CREATE UNIQUE INDEX IF NOT EXISTS "scrapedjob_url" ON "scrapedjob" ("url");
+    CREATE TABLE IF NOT EXISTS "clubdocumentedrole" ("id" INTEGER NOT NULL PRIMARY KEY, "name" VARCHAR(255) NOT NULL, "mention" VARCHAR(255) NOT NULL, "slug" VARCHAR(255) NOT NULL, "description" TEXT NOT NULL, "position" INTEGER NOT NULL, "emoji" VARCHAR(255));
+    CREATE TABLE IF NOT EXISTS "clubpinreaction" ("id" INTEGER NOT NULL PRIMARY KEY, "user_id" INTEGER NOT NULL, "message_id" INTEGER NOT NULL, FOREIGN KEY ("user_id") REFERENCES "clubuser" ("id"), FOREIGN KEY ("message_id") REFERENCES "clubmessage" ("id"));
+    CREATE INDEX IF NOT EXISTS "scrapedjob_last_seen_on" ON "scrapedjob" ("last_seen_on");
+    CREATE UNIQUE INDEX IF NOT EXISTS "scrapedjob_url" ON "scrapedjob" ("url");
     """
-        ).strip()
-    )
+).strip()
+
+SCHEMA_WITH_DATA = dedent(
+    """
+    CREATE UNIQUE INDEX "scrapedjob_url" ON "scrapedjob" ("url");
+    INSERT INTO "transaction" VALUES(175,'2021-09-01','donations',6);
+    """
+).strip()
+
+
+def test_make_schema_idempotent():
+    assert make_schema_idempotent(SCHEMA).strip() == SCHEMA_IDEMPOTENT
 
 
 def test_make_schema_idempotent_raises():
     with pytest.raises(ValueError):
-        make_schema_idempotent(
-            dedent(
-                """
-            CREATE UNIQUE INDEX "scrapedjob_url" ON "scrapedjob" ("url");
-            INSERT INTO "transaction" VALUES(175,'2021-09-01','donations',6);
-        """
-            )
-        )
+        make_schema_idempotent(SCHEMA_WITH_DATA)
 
 
-@pytest.mark.parametrize(
-    "row_from, row_to, expected",
-    [
-        (dict(), dict(), dict()),
-        (dict(a=1, b=2, c=3), dict(a=1, b=2, c=3), dict()),
-        (dict(a=None, b=None, c=3), dict(a=None, b=None, c=3), dict()),
-        (dict(a=1, b=2, c=3), dict(a=1, b=None, c=3), dict(b=2)),
-        (dict(a=None, b=None, c=3), dict(a=1, b=2, c=3), dict()),
-        (dict(a=None, b=42, c=3, d=None), dict(a=1, b=None, c=3, d=None), dict(b=42)),
-    ],
-)
-def test_get_row_updates(row_from, row_to, expected):
-    assert get_row_updates(row_from, row_to) == expected
+GET_ROW_UPDATES_CASES = [
+    (dict(), dict(), dict()),
+    (dict(a=1, b=2, c=3), dict(a=1, b=2, c=3), dict()),
+    (dict(a=None, b=None, c=3), dict(a=None, b=None, c=3), dict()),
+    (dict(a=1, b=2, c=3), dict(a=1, b=None, c=3), dict(b=2)),
+    (dict(a=None, b=None, c=3), dict(a=1, b=2, c=3), dict()),
+    (dict(a=None, b=42, c=3, d=None), dict(a=1, b=None, c=3, d=None), dict(b=42)),
+]
+
+
+def test_get_row_updates():
+    # the cases are tiny and pure, a plain loop keeps pytest from
+    # registering and reporting a test node for each of them
+    for row_from, row_to, expected in GET_ROW_UPDATES_CASES:
+        assert get_row_updates(row_from, row_to) == expected, (row_from, row_to)
 
 
 @pytest.mark.parametrize(
@@ -26,12 +26,12 @@ def find_fill(svg_text):
         raise ValueError("Could not find the fill declaration in given SVG")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def source_of_truth():
     path = PACKAGE_DIR / "css/_defaults.scss"
     return {
         match.group(1): match.group(2)
-        for match in parse(path.read_text(), SCSS_VARIABLE_RE)
+        for match in parse(path.read_bytes().decode("utf-8"), SCSS_VARIABLE_RE)
         if match.group(1).startswith("$jg-")
     }
 
@@ -40,12 +40,14 @@ def test_source_of_truth_variables_exist(source_of_truth):
     assert source_of_truth
 
 
+LEGACY_WEB_SCSS = (
+    (PACKAGE_DIR / "css_legacy/spaghetti/variables.scss").read_bytes().decode("utf-8")
+)
+
+
 VARS_LEGACY_WEB = [
     (match.group(1), match.group(2))
-    for match in parse(
-        (PACKAGE_DIR / "css_legacy/spaghetti/variables.scss").read_text(),
-        SCSS_VARIABLE_RE,
-    )
+    for match in parse(LEGACY_WEB_SCSS, SCSS_VARIABLE_RE)
     if match.group(1).startswith("$jg-")
 ]
 
@@ -61,10 +63,7 @@ def test_legacy_web(name, value, source_of_truth):
 
 VARS_LEGACY_WEB_DOTS = [
     (match.group(1), match.group(2))
-    for match in parse(
-        (PACKAGE_DIR / "css_legacy/spaghetti/variables.scss").read_text(),
-        SCSS_VARIABLE_RE,
-    )
+    for match in parse(LEGACY_WEB_SCSS, SCSS_VARIABLE_RE)
     if match.group(1).startswith("$dots-")
 ]
 
@@ -34,3 +34,12 @@ def test_interviews_listing(test_db, topics, expected):
     mentor = Mentor.create(id=123, name="Honza J.", topics=topics, user=user)
 
     assert list(Mentor.interviews_listing()) == ([mentor] if expected else [])
+
+
+def test_interviews_listing_selects_users_eagerly(test_db):
+    user = ClubUser.create(id=123, display_name="Honza", mention="<@111>")
+    Mentor.create(id=123, name="Honza J.", topics="pohovor", user=user)
+
+    mentor = list(Mentor.interviews_listing())[0]
+
+    assert mentor.__rel__["user"] == user
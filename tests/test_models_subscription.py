@@ -2,28 +2,141 @@ from datetime import date, datetime
 
 import pytest
 
-from juniorguru.models.subscription import SubscriptionActivity
+from juniorguru.models.subscription import SubscriptionActivity, _active_summary
 
 from testing_utils import prepare_test_db
 
 
 def create_activity(
-    account_id: int, type: str, happened_at: datetime
+    account_id: int, type: str, happened_at: datetime, **kwargs
 ) -> SubscriptionActivity:
     return SubscriptionActivity.create(
         account_id=account_id,
         type=type,
-        account_has_feminine_name=True,
+        account_has_feminine_name=kwargs.pop("account_has_feminine_name", True),
         happened_at=happened_at,
         happened_on=happened_at.date(),
+        **kwargs,
     )
 
 
 @pytest.fixture
 def test_db():
+    _active_summary.cache_clear()
     yield from prepare_test_db([SubscriptionActivity])
 
 
+def test_add_many(test_db):
+    SubscriptionActivity.add_many(
+        [
+            dict(
+                account_id=1,
+                type="order",
+                account_has_feminine_name=False,
+                happened_at=datetime(2023, 1, 1, 10),
+                happened_on=date(2023, 1, 1),
+            ),
+            dict(
+                account_id=1,
+                type="order",
+                account_has_feminine_name=False,
+                happened_at=datetime(2023, 1, 1, 12),
+                happened_on=date(2023, 1, 1),
+                order_coupon_slug="coupon123",
+            ),
+            dict(
+                account_id=1,
+                type="order",
+                account_has_feminine_name=False,
+                happened_at=datetime(2023, 1, 1, 9),
+                happened_on=date(2023, 1, 1),
+            ),
+        ]
+    )
+
+    activity = SubscriptionActivity.get()
+    assert activity.happened_at == datetime(2023, 1, 1, 12)
+    assert activity.order_coupon_slug == "coupon123"
+
+
+def test_active_summary(test_db):
+    create_activity(
+        1,
+        "order",
+        datetime(2023, 3, 1),
+        subscription_type="individual",
+        subscription_interval="year",
+    )
+    create_activity(
+        2,
+        "order",
+        datetime(2023, 3, 2),
+        account_has_feminine_name=False,
+        subscription_type="free",
+        subscription_interval="month",
+    )
+    create_activity(
+        3,
+        "deactivation",
+        datetime(2023, 3, 3),
+        account_has_feminine_name=False,
+        subscription_type="individual",
+        subscription_interval="month",
+    )
+
+    assert SubscriptionActivity.active_summary(date(2023, 4, 1)) == {
+        "count": 2,
+        "women_count": 1,
+        "individuals_count": 1,
+        "individuals_yearly_count": 1,
+        "no_subscription_type_count": 0,
+        "subscription_types": {
+            "free": 1,
+            "finaid": 0,
+            "individual": 1,
+            "trial": 0,
+            "partner": 0,
+            "student": 0,
+        },
+    }
+
+
+def test_active_subscription_type_breakdown(test_db):
+    create_activity(1, "order", datetime(2023, 3, 1), subscription_type="individual")
+    create_activity(2, "order", datetime(2023, 3, 2), subscription_type="free")
+    create_activity(3, "order", datetime(2023, 3, 3), subscription_type="free")
+
+    assert SubscriptionActivity.active_subscription_type_breakdown(
+        date(2023, 4, 1)
+    ) == {
+        "free": 2,
+        "finaid": 0,
+        "individual": 1,
+        "trial": 0,
+        "partner": 0,
+        "student": 0,
+    }
+
+
+def test_active_subscription_type_breakdown_raises_on_missing_type(test_db):
+    create_activity(1, "order", datetime(2023, 3, 1))
+
+    with pytest.raises(ValueError):
+        SubscriptionActivity.active_subscription_type_breakdown(date(2023, 4, 1))
+
+
+def test_active_women_ptc(test_db):
+    create_activity(1, "order", datetime(2023, 3, 1))
+    create_activity(2, "order", datetime(2023, 3, 2))
+    create_activity(3, "order", datetime(2023, 3, 3), account_has_feminine_name=False)
+
+    assert SubscriptionActivity.active_women_ptc(date(2023, 4, 1)) == 67
+
+
+def test_active_women_ptc_no_activities(test_db):
+    assert SubscriptionActivity.active_women_ptc(date(2023, 4, 1)) == 0
+
+
 def test_account_subscribed_at(test_db):
     create_activity(1, "order", datetime(2023, 7, 17))
     create_activity(1, "order", datetime(2023, 6, 17))